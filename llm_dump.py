@@ -1,4 +1,5 @@
+"""Thin launcher shim; all implementation lives in the llm_dump package."""
 from llm_dump.cli import cli
 
 if __name__ == "__main__":
-    cli()
\ No newline at end of file
+    cli()
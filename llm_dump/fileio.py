@@ -0,0 +1,42 @@
+import mmap
+import os
+
+# Files at or below this size are slurped in one read call; larger files are
+# read in fixed-size chunks and joined to avoid buffer re-allocation.
+_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+# Files above this size are memory-mapped instead of read, saving one
+# user-space copy of the data
+_MMAP_THRESHOLD = 256 * 1024
+
+# Directory names dropped by every walker regardless of gitignore contents;
+# a frozenset so the check is one hash lookup
+ALWAYS_IGNORE = frozenset({'.git'})
+
+def read_text(file_path) -> str:
+    """
+    Read a file's entire content as text; accepts a Path or a plain string.
+
+    Works on a raw fd with os.read, which releases the GIL around the actual
+    read(2) syscall (so thread-pooled readers truly overlap) and skips the
+    io-module wrapper layers, then decodes once.
+    """
+    fd = os.open(file_path, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        if size > _MMAP_THRESHOLD:
+            try:
+                with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+                    return mm[:].decode('utf-8', errors='replace')
+            except (OSError, ValueError):
+                pass  # Not mappable (e.g. special file); use the read path
+        data = os.read(fd, size or _CHUNK_SIZE)
+        if len(data) >= size:
+            # The usual case: the whole file arrived in one read
+            return data.decode('utf-8', errors='replace')
+        chunks = [data]
+        while (buf := os.read(fd, _CHUNK_SIZE)):
+            chunks.append(buf)
+        return b''.join(chunks).decode('utf-8', errors='replace')
+    finally:
+        os.close(fd)
@@ -1,116 +1,314 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import chain
 from pathlib import Path
+import os
+import pickle
+import posixpath
 import re
 from typing import Set, Optional
 import click
+from llm_dump.fileio import read_text, ALWAYS_IGNORE as _ALWAYS_IGNORE
 from llm_dump.utility_types import ObsidianTraversalInput, FileContent
 from llm_dump.group import cli
 
+# Optional compiled link extractor, built and installed separately; the
+# pure-Python path below is the default. A backend must expose
+# extract_links(content: str) -> iterable[str] matching
+# extract_markdown_links exactly: wiki links with the |alias dropped,
+# standard links with http(s)/ftp targets excluded, and anchors (#...)
+# stripped from both forms. It is verified against a probe document at
+# import time and rejected if the results differ, so an incompatible module
+# under this name can never silently change public behavior.
+_FASTLINKS_PROBE = "[[a|alias]] [[b#anchor]] [text](c.md#frag) [ext](https://x)"
+
+def _load_fastlinks():
+    try:
+        from llm_dump import _fastlinks
+    except ImportError:
+        return None
+    try:
+        if set(_fastlinks.extract_links(_FASTLINKS_PROBE)) == {'a', 'b', 'c.md'}:
+            return _fastlinks
+    except Exception:
+        pass
+    return None
+
+_fastlinks = _load_fastlinks()
+
+# Compiled once at import time so repeated extraction calls never pay pattern
+# lookup or recompilation costs (re's LRU cache can be evicted under load).
+# A single alternation covers both Obsidian wiki-style links [[link]] /
+# [[link|alias]] / [[link#anchor]] and standard markdown links [text](link),
+# so the content is scanned only once. The wiki group stops at the first
+# '|' or '#', so aliases and anchors are dropped during the match itself.
+_LINK_RE = re.compile(r'\[\[(?P<wiki>[^\]|#]+)(?:[#|][^\]]*)?\]\]|\[[^\]]*\]\((?P<md>[^)]+)\)')
+_EXTERNAL_PREFIXES = ('http://', 'https://', 'ftp://')
+
 def extract_markdown_links(content: str) -> Set[str]:
     """
     Extract both Obsidian wiki-style links and standard markdown links from content.
     """
-    # Match Obsidian wiki-style links [[link]] or [[link|alias]], excluding the alias part
-    wiki_links = set()
-    for match in re.findall(r'\[\[(.*?)\]\]', content):
-        # Split on pipe and take the first part (the actual link)
-        wiki_links.add(match.split('|')[0])
-        
-    # Match standard markdown links [text](link), excluding external links
-    md_links = set()
-    for link in re.findall(r'\[(?:[^\]]*)\]\(([^)]+)\)', content):
-        if not link.startswith(('http://', 'https://', 'ftp://')):
-            md_links.add(link)
-    
-    # Remove any anchor tags (#) from all links
-    cleaned_links = {link.split('#')[0] for link in wiki_links.union(md_links)}
-    return cleaned_links
+    if _fastlinks is not None:
+        return set(_fastlinks.extract_links(content))
+    links = set()
+    # Cheap gate: no '[' anywhere means no links of either form, so skip the
+    # regex scan entirely (common for plain prose notes)
+    if '[' not in content:
+        return links
+    for match in _LINK_RE.finditer(content):
+        link = match.group('wiki')
+        if link is not None:
+            # Alias and anchor were already excluded by the pattern
+            links.add(link)
+        else:
+            link = match.group('md')
+            if not link.startswith(_EXTERNAL_PREFIXES):
+                # Remove any anchor tag (#)
+                links.add(link.partition('#')[0])
+
+    return links
+
+# On-disk cache for repeated dumps (e.g. CI): maps (realpath, mtime_ns, size)
+# to (content, extracted links), so unchanged files skip both the read and
+# the link-extraction pass on later runs. Only used when the caller opts in.
+def _cache_file() -> Path:
+    """
+    Resolve the cache location, honoring XDG_CACHE_HOME at call time so
+    callers (and tests) can redirect it via the environment.
+    """
+    return Path(os.environ.get('XDG_CACHE_HOME', str(Path.home() / '.cache'))) / 'llm-dump' / 'cache.pkl'
+
+def _load_content_cache() -> dict:
+    """
+    Load the persisted content cache, returning an empty dict if missing or unreadable.
+    """
+    try:
+        with open(_cache_file(), 'rb') as f:
+            return pickle.load(f)
+    except Exception:
+        return {}
+
+def _save_content_cache(cache: dict):
+    """
+    Persist the content cache atomically (write to a temp file, then rename).
+    """
+    cache_file = _cache_file()
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_file.with_suffix('.tmp')
+        with open(tmp, 'wb') as f:
+            pickle.dump(cache, f)
+        os.replace(tmp, cache_file)
+    except Exception as e:
+        print(f"Error saving cache: {e}")
+
+def _load_note(file_path: Path, cache: Optional[dict]):
+    """
+    Read a note, consulting the cache when enabled.
+
+    Returns (content, links, added): links is None when the cache is disabled
+    (the caller extracts lazily only if it needs them), and added is True when
+    a fresh entry was stored so the caller knows to persist the cache.
+    """
+    try:
+        if cache is None:
+            return read_text(file_path), None, False
+        st = os.stat(file_path)
+        key = (os.path.realpath(file_path), st.st_mtime_ns, st.st_size)
+        hit = cache.get(key)
+        if hit is not None:
+            return hit[0], hit[1], False
+        content = read_text(file_path)
+        links = extract_markdown_links(content)
+        cache[key] = (content, links)
+        return content, links, True
+    except Exception as e:
+        print(f"Error reading {file_path}: {e}")
+        return None, None, False
 
 def process_markdown_file(file_path: Path, base_folder: Path) -> FileContent:
     """
     Read a markdown file and return its content.
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = read_text(file_path)
         return FileContent(file_path=file_path, content=content)
     except Exception as e:
         print(f"Error reading {file_path}: {e}")
         return None
 
+@lru_cache(maxsize=4096)
 def ensure_md_extension(file_path: str) -> str:
     """
     Ensure the file path ends with .md extension
+
+    Cached because the same link strings recur across many notes; the hot
+    case collapses to a dict lookup returning the input unchanged.
     """
-    if not file_path.endswith('.md'):
-        return f"{file_path}.md"
-    return file_path
+    return file_path if file_path.endswith('.md') else f"{file_path}.md"
 
-def resolve_markdown_link(link: str, current_file: Path, base_folder: Path) -> Optional[Path]:
+@lru_cache(maxsize=None)
+def _resolve(link: str, parent: str, base: str) -> Optional[str]:
     """
-    Resolve a markdown link to an actual file path.
+    Cached core of resolve_markdown_link, keyed on plain strings.
+
+    The same link target tends to appear in many notes; caching here skips
+    the repeated existence-check stat syscalls on every later occurrence.
+    Works entirely on strings with os.path so no intermediate Path objects
+    are allocated per candidate.
     """
     # Handle relative paths (../file)
     if link.startswith('../'):
-        potential_path = current_file.parent.parent / link[3:]
+        candidate = os.path.join(os.path.dirname(parent), link[3:])
     else:
         # If the link doesn't start with '../', try resolving from current file's directory first
-        potential_path = current_file.parent / link
-        if not potential_path.exists():
+        candidate = os.path.join(parent, link)
+        if not os.path.exists(candidate):
             # If not found, try from base folder
-            potential_path = base_folder / link
+            candidate = os.path.join(base, link)
 
     # Ensure .md extension
-    potential_path = potential_path.parent / ensure_md_extension(potential_path.name)
-    
+    candidate = ensure_md_extension(candidate)
+
     # Check if the file exists
-    if potential_path.exists():
-        return potential_path
+    if os.path.exists(candidate):
+        return candidate
     return None
 
-def traverse_markdown_files(input_data: ObsidianTraversalInput, visited: Set[Path] = None, current_depth: int = 0):
+def resolve_markdown_link(link: str, current_file: Path, base_folder: Path) -> Optional[Path]:
     """
-    Traverse markdown files starting from the input file up to max_depth, collecting all content.
+    Resolve a markdown link to an actual file path.
+    """
+    resolved = _resolve(link, str(current_file.parent), str(base_folder))
+    return Path(resolved) if resolved else None
+
+def _build_md_index(base_folder: Path):
+    """
+    Walk base_folder once and index every .md file by its extension-less
+    relative posix path, plus by bare name as an Obsidian-style fallback.
+
+    Link resolution then becomes pure dict lookups instead of up to three
+    stat syscalls per link.
+    """
+    rel_index = {}
+    name_index = {}
+    base_len = len(str(base_folder)) + 1
+
+    def _scan(current: str):
+        try:
+            for entry in os.scandir(current):
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name in _ALWAYS_IGNORE:
+                        continue
+                    _scan(entry.path)
+                elif entry.name.endswith('.md'):
+                    rel = entry.path[base_len:].replace(os.sep, '/')[:-3]
+                    rel_index[rel] = entry.path
+                    name_index.setdefault(entry.name[:-3], entry.path)
+        except OSError as e:
+            # An unreadable subdirectory shouldn't abort the traversal; notes
+            # inside it simply won't resolve, matching the read-error policy
+            print(f"Error scanning {current}: {e}")
+
+    _scan(str(base_folder))
+    return rel_index, name_index
+
+def _resolve_indexed(link: str, current_rel_dir: str, rel_index: dict, name_index: dict) -> Optional[str]:
+    """
+    Resolve a link against a prebuilt index, mirroring resolve_markdown_link's
+    order: current file's directory first, then the base folder, then by name.
+    """
+    target = link[:-3] if link.endswith('.md') else link
+    if current_rel_dir:
+        resolved = rel_index.get(posixpath.normpath(f"{current_rel_dir}/{target}"))
+        if resolved:
+            return resolved
+    resolved = rel_index.get(posixpath.normpath(target))
+    if resolved:
+        return resolved
+    return name_index.get(posixpath.basename(target))
+
+def _iter_markdown_files(input_data: ObsidianTraversalInput, visited: Set[str] = None, current_depth: int = 0):
+    """
+    Traverse markdown files starting from the input file up to max_depth, yielding FileContent.
+
+    The traversal is an iterative, level-synchronized breadth-first search:
+    no Python recursion (so no recursion-limit concerns on deep vaults), no
+    per-link ObsidianTraversalInput construction, and each level's files are
+    read concurrently.
+    Visited membership is keyed on realpath strings, so the same note reached
+    via differently-spelled paths (foo.md vs ./foo.md, or via a symlink) is
+    still visited only once, and hashing a str is cheaper than hashing a Path.
     """
     if visited is None:
         visited = set()
-    
+
     base_folder = input_data.base_folder or Path.cwd()
-    current_file = base_folder / ensure_md_extension(input_data.start_file)
-    
-    if not current_file.is_file():
-        raise ValueError(f"File not found: {current_file}")
-    
-    if current_file in visited:
-        return []
-    
-    visited.add(current_file)
-    file_content = process_markdown_file(current_file, base_folder)
-    if not file_content:
-        return []
-    
-    results = [file_content]
-    
-    # Only process links if we haven't reached max_depth
-    if current_depth >= input_data.max_depth:
-        return results
-    
-    # Extract and process links
-    links = extract_markdown_links(file_content.content)
-    for link in links:
-        resolved_path = resolve_markdown_link(link, current_file, base_folder)
-        if resolved_path and resolved_path not in visited:
-            # For nested files, use path relative to base_folder
-            nested_start = str(resolved_path.relative_to(base_folder))
-            nested_input = ObsidianTraversalInput(
-                start_file=nested_start,
-                output_file=input_data.output_file,
-                max_depth=input_data.max_depth,
-                base_folder=base_folder
-            )
-            nested_results = traverse_markdown_files(nested_input, visited, current_depth + 1)
-            results.extend(nested_results)
-    
-    return results
+    start_file = base_folder / ensure_md_extension(input_data.start_file)
+
+    if not start_file.is_file():
+        raise ValueError(f"File not found: {start_file}")
+
+    # One walk up front, then every link resolves via dict lookup with no
+    # stat syscalls
+    rel_index, name_index = _build_md_index(base_folder)
+    base_str = str(base_folder)
+
+    cache = _load_content_cache() if input_data.use_cache else None
+    cache_dirty = False
+
+    # Level-synchronized BFS: each depth's frontier is read as a batch, with
+    # the reads overlapped in a thread pool (open/read release the GIL), which
+    # keeps the max-depth semantics intact while hiding per-file I/O latency.
+    # The queue and indexes carry plain strings; a Path is materialized only
+    # when constructing the yielded FileContent
+    frontier = [(str(start_file), os.path.realpath(start_file), current_depth)]
+    while frontier:
+        batch = []
+        for current_file, key, depth in frontier:
+            if key in visited:
+                continue
+            visited.add(key)
+            batch.append((current_file, key, depth))
+
+        if len(batch) > 1:
+            with ThreadPoolExecutor(max_workers=min(32, len(batch))) as executor:
+                loaded = list(executor.map(lambda item: _load_note(item[0], cache), batch))
+        else:
+            loaded = [_load_note(item[0], cache) for item in batch]
+
+        next_frontier = []
+        for (current_file, key, depth), (content, links, added) in zip(batch, loaded):
+            if content is None:
+                continue
+            cache_dirty = cache_dirty or added
+            yield FileContent(file_path=Path(current_file), content=content)
+
+            # Only process links if we haven't reached max_depth
+            if depth >= input_data.max_depth:
+                continue
+            if links is None:
+                links = extract_markdown_links(content)
+            current_rel_dir = os.path.relpath(os.path.dirname(current_file), base_str).replace(os.sep, '/')
+            if current_rel_dir == '.':
+                current_rel_dir = ''
+            for link in links:
+                resolved_path = _resolve_indexed(link, current_rel_dir, rel_index, name_index)
+                if resolved_path:
+                    resolved_key = os.path.realpath(resolved_path)
+                    if resolved_key not in visited:
+                        next_frontier.append((resolved_path, resolved_key, depth + 1))
+        frontier = next_frontier
+
+    if cache is not None and cache_dirty:
+        _save_content_cache(cache)
+
+def traverse_markdown_files(input_data: ObsidianTraversalInput, visited: Set[str] = None, current_depth: int = 0):
+    """
+    Traverse markdown files starting from the input file up to max_depth, collecting all content.
+    """
+    return list(_iter_markdown_files(input_data, visited, current_depth))
 
 def dump_markdown_files(input_data: ObsidianTraversalInput):
     """
@@ -120,21 +318,32 @@ def dump_markdown_files(input_data: ObsidianTraversalInput):
     if not input_data.base_folder:
         input_data.base_folder = Path(input_data.start_file).parent
 
-    files = traverse_markdown_files(input_data)
-    
-    with open(input_data.output_file, 'w', encoding='utf-8') as output_file:
-        for file_content in files:
+    # Start each top-level dump with a fresh resolution cache: bounds memory
+    # and avoids stale hits if files changed between runs in one process
+    _resolve.cache_clear()
+
+    files = _iter_markdown_files(input_data)
+    # Pull the first file eagerly so a missing start file raises before the
+    # output file is created
+    first = next(files, None)
+
+    # Streaming the generator keeps peak memory at one BFS level instead of
+    # the whole vault; a 1 MiB buffer batches the blocks into few syscalls
+    with open(input_data.output_file, 'w', encoding='utf-8', buffering=1 << 20) as output_file:
+        for file_content in chain([first] if first else [], files):
             relative_path = file_content.file_path.relative_to(input_data.base_folder)
-            output_file.write(f"--- Start of {relative_path} ---\n")
-            output_file.write(file_content.content + "\n")
-            output_file.write(f"--- End of {relative_path} ---\n\n")
+            output_file.write(
+                f"--- Start of {relative_path} ---\n{file_content.content}\n"
+                f"--- End of {relative_path} ---\n\n"
+            )
 
 @cli.command()
 @click.argument('start_file', type=click.Path(exists=True, dir_okay=False))
 @click.argument('output_file', type=click.Path(dir_okay=False))
 @click.option('--max-depth', type=int, default=2, help='Maximum depth to traverse (default: 2)')
 @click.option('--base-folder', type=click.Path(exists=True, file_okay=False, dir_okay=True), help='Base folder for resolving links')
-def markdown(start_file: str, output_file: str, max_depth: int, base_folder: Optional[str]):
+@click.option('--cache/--no-cache', default=False, help='Reuse unchanged file contents from previous runs')
+def markdown(start_file: str, output_file: str, max_depth: int, base_folder: Optional[str], cache: bool):
     """Process Obsidian/markdown files.
     
     START_FILE is the path to the starting markdown file
@@ -144,6 +353,7 @@ def markdown(start_file: str, output_file: str, max_depth: int, base_folder: Opt
         start_file=start_file,
         output_file=output_file,
         max_depth=max_depth,
-        base_folder=base_folder
+        base_folder=base_folder,
+        use_cache=cache
     )
     dump_markdown_files(md_input)
@@ -1,82 +1,359 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 import click
 from pathspec import PathSpec
 from typing import List
 import os
+import re
+import shutil
+from llm_dump.fileio import read_text, ALWAYS_IGNORE as _ALWAYS_IGNORE
 from llm_dump.utility_types import FileContent, FolderTraversalInput
 from llm_dump.group import cli  # Import from group instead of cli
 
-def load_gitignore(folder: Path) -> PathSpec:
+# Optional SIMD-accelerated matching for pattern-heavy gitignores
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+# Strips named groups like (?P<ps_d>...) so patterns can be alternated
+# without group-name collisions
+_NAMED_GROUP_RE = re.compile(r'\(\?P<[^>]+>')
+
+def _record_match(_id, _start, _end, _flags, found):
+    """Hyperscan match callback: record the hit and keep scanning."""
+    found.append(_id)
+
+class FusedSpec:
     """
-    Load .gitignore file and parse it into a PathSpec object.
-    Always includes .git directory in ignored patterns.
+    A PathSpec wrapper whose match_file runs a single fused regex.
+
+    PathSpec.match_file walks every pattern per path, which is O(files x
+    patterns) pure-Python work. Fusing all positive patterns into one
+    alternation (guarded by a negative lookahead over the negation patterns)
+    turns that into one C-level regex match. Falls back to the wrapped
+    PathSpec if the fused pattern cannot be compiled. Note the lookahead is
+    an approximation of gitignore's last-match-wins ordering: a negation
+    always wins over any positive match, which covers the common
+    "exclude then re-include" layout.
+    """
+
+    def __init__(self, spec: PathSpec, dir_prefixes: tuple = (".git/",)):
+        self._spec = spec
+        self.dir_prefixes = dir_prefixes
+        positives, negatives = [], []
+        for p in spec.patterns:
+            if p.include is None or p.regex is None:
+                continue
+            pattern = _NAMED_GROUP_RE.sub('(?:', p.regex.pattern)
+            (positives if p.include else negatives).append(f"(?:{pattern})")
+        self._re = None
+        if positives:
+            fused = "|".join(positives)
+            if negatives:
+                fused = f"(?!{'|'.join(negatives)})(?:{fused})"
+            try:
+                self._re = re.compile(fused)
+            except re.error:
+                self._re = None
+        # When the hyperscan extra is installed and the spec has no negations,
+        # compile the patterns into a Hyperscan block database as well; its
+        # SIMD scan beats the re module on pattern-heavy gitignores. Any
+        # pattern Hyperscan cannot express just leaves the re fast path in use.
+        self._hs_db = None
+        if hyperscan is not None and positives and not negatives:
+            try:
+                db = hyperscan.Database()
+                flag = hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_ALLOWEMPTY
+                db.compile(
+                    expressions=[p.encode('utf-8') for p in positives],
+                    elements=len(positives),
+                    flags=[flag] * len(positives),
+                )
+                self._hs_db = db
+            except Exception:
+                self._hs_db = None
+
+    def match_file(self, path: str) -> bool:
+        if self._hs_db is not None:
+            try:
+                found = []
+                self._hs_db.scan(path.encode('utf-8'), match_event_handler=_record_match, context=found)
+                return bool(found)
+            except Exception:
+                self._hs_db = None  # Degrade to the re path permanently
+        if self._re is not None:
+            return self._re.match(path) is not None
+        return self._spec.match_file(path)
+
+def _dir_prefixes(patterns) -> tuple:
+    """
+    Extract plain `name/` gitignore lines as literal directory prefixes.
+
+    These can be tested with a single str.startswith before paying for a full
+    PathSpec.match_file pass. Negation patterns could re-include paths inside
+    such a directory, so the fast path is disabled when any are present.
+    """
+    prefixes = {".git/"}
+    for line in patterns:
+        line = line.strip()
+        if line.startswith('!'):
+            return (".git/",)
+        if (line.endswith('/') and line.count('/') == 1
+                and not any(c in line for c in '*?[#')):
+            prefixes.add(line)
+    return tuple(prefixes)
+
+@lru_cache(maxsize=128)
+def _load_gitignore_cached(folder: str, mtime_ns: int) -> FusedSpec:
+    """
+    Parse and fuse a folder's .gitignore; cached on (folder, mtime) so
+    repeated traversals of the same unchanged folder reuse the compiled spec.
     """
     # Default patterns that should always be ignored
     default_patterns = [
         ".git/",
         ".git/**/*"
     ]
-    
-    gitignore_path = folder / ".gitignore"
-    if gitignore_path.exists():
+
+    gitignore_path = os.path.join(folder, ".gitignore")
+    if mtime_ns >= 0:
         with open(gitignore_path, 'r', encoding='utf-8') as f:
             patterns = list(f) + default_patterns
-            return PathSpec.from_lines("gitwildmatch", patterns)
-    
-    return PathSpec.from_lines("gitwildmatch", default_patterns)
+    else:
+        patterns = default_patterns
 
-def generate_file_tree(folder: Path, prefix="", pathspec=None, base_folder=None) -> str:
+    spec = PathSpec.from_lines("gitwildmatch", patterns)
+    return FusedSpec(spec, _dir_prefixes(patterns))
+
+def load_gitignore(folder: Path) -> FusedSpec:
     """
-    Recursively generate a tree structure for a given folder, respecting .gitignore.
+    Load .gitignore file and parse it into a FusedSpec object.
+    Always includes .git directory in ignored patterns.
+
+    The returned spec matches paths with one fused regex instead of a
+    per-pattern walk, and carries a dir_prefixes tuple of literal ignored
+    directory prefixes so walkers can skip obvious matches cheaply.
     """
-    if base_folder is None:
-        base_folder = folder
-    
-    tree = []
-    entries = sorted(folder.iterdir(), key=lambda x: (x.is_file(), x.name))
-    
-    for idx, entry in enumerate(entries):
-        # Compute the relative path from the base_folder
-        relative_entry = entry.relative_to(base_folder).as_posix()
-        if entry.is_dir():
+    try:
+        mtime_ns = os.stat(os.path.join(folder, ".gitignore")).st_mtime_ns
+    except OSError:
+        mtime_ns = -1  # No .gitignore; defaults only
+    return _load_gitignore_cached(str(folder), mtime_ns)
+
+# Hook for tests and long-lived callers to drop cached specs
+load_gitignore.cache_clear = _load_gitignore_cached.cache_clear
+
+def _build_tree(folder: str, out: list, prefix: str, pathspec, base_len: int):
+    """
+    Append tree lines for one directory level to the shared out list.
+    """
+    # Scan once, caching is_dir so it is not re-checked per entry, and drop
+    # ignored entries up front; ignored directories are never scanned at all.
+    prefixes = getattr(pathspec, 'dir_prefixes', ())
+    try:
+        scan = os.scandir(folder)
+    except OSError as err:
+        # An unreadable directory shouldn't abort the tree; skip it and report
+        print(f"Error scanning {folder}: {err}")
+        return
+    entries = []
+    for e in scan:
+        is_dir = e.is_dir(follow_symlinks=False)
+        relative_entry = e.path[base_len:].replace(os.sep, '/')
+        if is_dir:
+            if e.name in _ALWAYS_IGNORE:
+                continue
             relative_entry += '/'
-            
+            if relative_entry.startswith(prefixes):
+                continue
         if pathspec and pathspec.match_file(relative_entry):
             continue  # Skip ignored files
-            
+        entries.append((e.name, e.path, is_dir))
+    entries.sort(key=lambda x: (not x[2], x[0]))
+
+    for idx, (name, path, is_dir) in enumerate(entries):
         is_last = idx == len(entries) - 1
         connector = "└── " if is_last else "├── "
-        
+
         # Add the current entry
-        tree.append(f"{prefix}{connector}{entry.name}")
-        
+        out.append(f"{prefix}{connector}{name}")
+
         # Recursively process directories
-        if entry.is_dir():
+        if is_dir:
             next_prefix = prefix + ("    " if is_last else "│   ")
-            subtree = generate_file_tree(entry, next_prefix, pathspec, base_folder)
-            if subtree:  # Only add non-empty subtrees
-                tree.append(subtree)
-    
+            _build_tree(path, out, next_prefix, pathspec, base_len)
+
+def generate_file_tree(folder: Path, prefix="", pathspec=None, base_folder=None) -> str:
+    """
+    Recursively generate a tree structure for a given folder, respecting .gitignore.
+
+    Lines accumulate in a single list threaded through the recursion, so the
+    string is joined exactly once at the top instead of once per level.
+    """
+    if base_folder is None:
+        base_folder = folder
+
+    tree = []
+    _build_tree(str(folder), tree, prefix, pathspec, len(str(base_folder)) + 1)
     return "\n".join(tree)
 
+def _read_one(item):
+    """Read a single (path, relative path) entry, returning a FileContent or None on error."""
+    file_path, rel = item
+    try:
+        return FileContent(file_path=file_path, content=read_text(file_path), relative_path=rel)
+    except Exception as e:
+        print(f"Error reading {file_path}: {e}")
+        return None
+
+def _iter_files(folder_path: Path, pathspec=None):
+    """
+    Yield (path, relative posix path) for every non-ignored file under
+    folder_path.
+
+    Uses os.scandir directly so directory-type checks reuse the metadata
+    returned by the directory read instead of issuing an extra stat per entry,
+    and skips ignored directories entirely rather than walking into them.
+    """
+    # Relative paths are built by slicing off the root prefix once, instead of
+    # calling Path.relative_to() per file.
+    root_len = len(str(folder_path)) + 1
+
+    # Literal directory prefixes are tested with one startswith before the
+    # full per-pattern pathspec match
+    prefixes = getattr(pathspec, 'dir_prefixes', ())
+
+    def _scan(current: str):
+        try:
+            entries = os.scandir(current)
+        except OSError as e:
+            # An unreadable directory shouldn't abort the traversal; skip it
+            # and report, as os.walk did silently
+            print(f"Error scanning {current}: {e}")
+            return
+        for entry in entries:
+            rel = entry.path[root_len:].replace(os.sep, '/')
+            if entry.is_dir(follow_symlinks=False):
+                # Prune ignored directories so their subtrees are never
+                # entered; .git is dropped even when no pathspec is given
+                if entry.name in _ALWAYS_IGNORE:
+                    continue
+                rel_dir = rel + '/'
+                if rel_dir.startswith(prefixes):
+                    continue
+                if pathspec and pathspec.match_file(rel_dir):
+                    continue
+                yield from _scan(entry.path)
+            elif entry.is_file():
+                # is_file() reuses the scandir d_type for regular files and
+                # only stats symlinks; fifos, sockets and broken symlinks are
+                # skipped instead of failing at read time
+                if pathspec and pathspec.match_file(rel):
+                    continue  # Skip ignored files
+                yield (Path(entry.path), rel)
+
+    yield from _scan(str(folder_path))
+
+def iter_folder(folder_path: Path, pathspec=None):
+    """
+    Lazily yield FileContent for every non-ignored file under folder_path.
+
+    File reads are farmed out to a thread pool: reading many small files is
+    latency-bound on open/read syscalls, which release the GIL. Submissions
+    are windowed so the readers stay at most a couple of batches ahead of the
+    consumer, bounding peak memory, and results are yielded in submission
+    order so output stays deterministic.
+    """
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    window = max_workers * 2
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for item in _iter_files(folder_path, pathspec):
+            pending.append(executor.submit(_read_one, item))
+            if len(pending) >= window:
+                fc = pending.popleft().result()
+                if fc:
+                    yield fc
+        while pending:
+            fc = pending.popleft().result()
+            if fc:
+                yield fc
+
 def traverse_folder(folder_path: Path, pathspec=None) -> List[FileContent]:
     """
     Recursively traverse a folder and collect file contents, respecting .gitignore.
     """
-    file_contents = []
-    for root, _, files in os.walk(folder_path):
-        for file in files:
-            file_path = Path(root) / file
-            relative_path = file_path.relative_to(folder_path).as_posix()
-            if pathspec and pathspec.match_file(relative_path):
-                continue  # Skip ignored files
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                file_contents.append(FileContent(file_path=file_path, content=content))
-            except Exception as e:
-                print(f"Error reading {file_path}: {e}")
-    return file_contents
+    return list(iter_folder(folder_path, pathspec))
+
+def _walk_once(folder_path: Path, pathspec=None):
+    """
+    Walk the folder a single time, producing both the tree lines and the
+    (path, relative path) file list for the dump body, so directory reads and
+    pathspec matches are not paid twice.
+    """
+    tree = []
+    files = []
+    root_len = len(str(folder_path)) + 1
+    prefixes = getattr(pathspec, 'dir_prefixes', ())
+
+    def _scan(current: str, prefix: str):
+        try:
+            scan = os.scandir(current)
+        except OSError as err:
+            # An unreadable directory shouldn't abort the dump; skip it and report
+            print(f"Error scanning {current}: {err}")
+            return
+        entries = []
+        for e in scan:
+            is_dir = e.is_dir(follow_symlinks=False)
+            rel = e.path[root_len:].replace(os.sep, '/')
+            if is_dir:
+                if e.name in _ALWAYS_IGNORE:
+                    continue
+                rel += '/'
+                if rel.startswith(prefixes):
+                    continue
+            if pathspec and pathspec.match_file(rel):
+                continue
+            entries.append((e.name, e.path, is_dir, False if is_dir else e.is_file(), rel))
+        entries.sort(key=lambda x: (not x[2], x[0]))
+
+        for idx, (name, path, is_dir, is_file, rel) in enumerate(entries):
+            is_last = idx == len(entries) - 1
+            tree.append(f"{prefix}{'└── ' if is_last else '├── '}{name}")
+            if is_dir:
+                _scan(path, prefix + ("    " if is_last else "│   "))
+            elif is_file:
+                files.append((Path(path), rel))
+
+    _scan(str(folder_path), "")
+    return "\n".join(tree), files
+
+def _splice(src, dst, size: int):
+    """
+    Copy size bytes from src into dst, preferring the zero-copy os.sendfile
+    path on platforms that support it between regular files.
+    """
+    # The kernel-side copy bypasses dst's Python-level buffer, so any pending
+    # header bytes must be flushed first to keep write ordering
+    dst.flush()
+    offset = 0
+    if hasattr(os, 'sendfile'):
+        try:
+            while offset < size:
+                sent = os.sendfile(dst.fileno(), src.fileno(), offset, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+            return
+        except OSError:
+            if offset:
+                raise
+    src.seek(0)
+    shutil.copyfileobj(src, dst, 1 << 20)
 
 def dump_files_to_text(input_data: FolderTraversalInput):
     """
@@ -87,24 +364,36 @@ def dump_files_to_text(input_data: FolderTraversalInput):
 
     # Load .gitignore rules if present
     pathspec = load_gitignore(folder_path)
-    
-    # Generate the file tree
-    tree_structure = generate_file_tree(folder_path, pathspec=pathspec)
-    
-    # Traverse the folder and collect file contents
-    files = traverse_folder(folder_path, pathspec=pathspec)
-    
-    # Write to the output file
-    with open(output_path, 'w', encoding='utf-8') as output_file:
+
+    # One walk produces both the tree and the file list
+    tree_structure, files = _walk_once(folder_path, pathspec=pathspec)
+
+    # Exclude the output file from its own dump if it lives inside the folder
+    # being dumped
+    try:
+        out_rel = output_path.resolve().relative_to(folder_path.resolve()).as_posix()
+    except ValueError:
+        out_rel = None
+
+    # The output is written in binary: file bodies are spliced straight from
+    # the source files without ever decoding them into Python strings, so the
+    # dump runs at copy bandwidth and holds no file content in memory.
+    with open(output_path, 'wb', buffering=1 << 20) as output_file:
         # Write the tree structure
-        output_file.write("File Tree Structure:\n")
-        output_file.write(tree_structure + "\n\n")
-        
-        # Write the content of each file
-        for file_content in files:
-            output_file.write(f"--- Start of {file_content.file_path.relative_to(folder_path)} ---\n")
-            output_file.write(file_content.content + "\n")
-            output_file.write(f"--- End of {file_content.file_path.relative_to(folder_path)} ---\n\n")
+        output_file.write(f"File Tree Structure:\n{tree_structure}\n\n".encode())
+
+        for file_path, rel in files:
+            if rel == out_rel:
+                continue
+            try:
+                src = open(file_path, 'rb')
+            except OSError as e:
+                print(f"Error reading {file_path}: {e}")
+                continue
+            with src:
+                output_file.write(f"--- Start of {rel} ---\n".encode())
+                _splice(src, output_file, os.fstat(src.fileno()).st_size)
+                output_file.write(f"\n--- End of {rel} ---\n\n".encode())
 
 @cli.command()  # Use cli.command() instead of click.command()
 @click.argument('folder_path', type=click.Path(exists=True, file_okay=False, dir_okay=True, path_type=Path))
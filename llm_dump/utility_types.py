@@ -1,9 +1,19 @@
-from pydantic import BaseModel, DirectoryPath, FilePath
+from dataclasses import dataclass
+from pathlib import Path
+from pydantic import BaseModel, DirectoryPath
 from typing import Optional
 
-class FileContent(BaseModel):
-    file_path: FilePath
+# A plain slotted dataclass rather than a Pydantic model: FileContent is
+# created once per traversed file, and Pydantic's FilePath validation costs a
+# stat() syscall plus model overhead per instance. Validation stays on the
+# CLI-level input models below, where it is cheap and useful.
+@dataclass(slots=True, frozen=True)
+class FileContent:
+    file_path: Path
     content: str
+    # Path relative to the traversal root, as a posix string; filled in by the
+    # walkers so writers never need to recompute Path.relative_to.
+    relative_path: str = ""
 
 class FolderTraversalInput(BaseModel):
     folder_path: DirectoryPath
@@ -13,4 +23,6 @@ class ObsidianTraversalInput(BaseModel):
     start_file: str
     output_file: str
     max_depth: int = 2
-    base_folder: Optional[DirectoryPath] = None
\ No newline at end of file
+    base_folder: Optional[DirectoryPath] = None
+    # Reuse file contents and extracted links across runs for unchanged files
+    use_cache: bool = False
\ No newline at end of file
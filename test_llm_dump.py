@@ -22,6 +22,9 @@ from llm_dump.repo import (
     dump_files_to_text,
 )
 
+# Compiled once; strips the box-drawing indent and connector from tree lines
+TREE_INDENT_RE = re.compile(r'^(?:(?:│ {3})| {4})*(?:├── |└── )')
+
 @pytest.fixture
 def temp_dir():
     """Create a temporary directory for test files."""
@@ -189,6 +192,35 @@ def test_dump_markdown_files(sample_vault):
     assert "--- Start of main.md ---" in content
     assert "--- End of main.md ---" in content 
 
+def test_markdown_content_cache(temp_dir, monkeypatch):
+    """Test that use_cache serves unchanged files from disk and invalidates on mtime change."""
+    monkeypatch.setenv('XDG_CACHE_HOME', str(temp_dir / 'cache'))
+    note = temp_dir / 'note.md'
+    note.write_text('# Original')
+
+    input_data = ObsidianTraversalInput(
+        start_file="note.md",
+        output_file="output.md",
+        base_folder=temp_dir,
+        use_cache=True
+    )
+
+    results = traverse_markdown_files(input_data)
+    assert results[0].content == '# Original'
+    assert (temp_dir / 'cache' / 'llm-dump' / 'cache.pkl').exists()
+
+    # Same mtime and size: the cached content is served without re-reading
+    st = note.stat()
+    note.write_text('# Tampered')
+    os.utime(note, ns=(st.st_atime_ns, st.st_mtime_ns))
+    results = traverse_markdown_files(input_data)
+    assert results[0].content == '# Original'
+
+    # A newer mtime invalidates the entry and the file is re-read
+    os.utime(note, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    results = traverse_markdown_files(input_data)
+    assert results[0].content == '# Tampered'
+
 def test_load_gitignore(temp_dir):
     """Test loading and parsing of .gitignore file."""
     # Create a .gitignore file
@@ -216,6 +248,16 @@ node_modules/
     assert not pathspec.match_file("src/main.js")
     assert not pathspec.match_file("config.json")
 
+def test_load_gitignore_negation(temp_dir):
+    """Test that negation patterns re-include files matched by earlier patterns."""
+    (temp_dir / ".gitignore").write_text("*.log\n!keep.log\n")
+
+    pathspec = load_gitignore(temp_dir)
+
+    assert pathspec.match_file("debug.log")
+    assert not pathspec.match_file("keep.log")
+    assert not pathspec.match_file("notes.txt")
+
 def test_generate_file_tree(temp_dir):
     """Test generation of file tree structure with .gitignore support."""
     # Create a sample repository structure
@@ -239,12 +281,11 @@ __pycache__/
     
     # Ensure the tree is split into lines correctly
     tree_lines = tree.split('\n')  # Use '\n' to split lines explicitly
-    
+
     # Helper function to clean tree lines
     def clean_line(line):
         # Remove tree structure characters and leading/trailing whitespace
-        pattern = r'^(?:(?:│ {3})| {4})*(?:├── |└── )'
-        return re.sub(pattern, '', line).strip()
+        return TREE_INDENT_RE.sub('', line).strip()
     
     cleaned_tree = [clean_line(line) for line in tree_lines]
     